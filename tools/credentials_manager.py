@@ -1,15 +1,23 @@
+import hashlib
+import hmac
+
+
 class CredentialsManager:
     """
     讯飞API凭据管理器，用于在不同模块间共享API凭据
+    凭据以不可变元组整体替换，并发读取时总能拿到一致的快照
     """
+    __slots__ = ("_creds", "_hmac_template")
     _instance = None
-    app_id = None
-    api_key = None
-    api_secret = None
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(CredentialsManager, cls).__new__(cls)
+            instance = super(CredentialsManager, cls).__new__(cls)
+            # (app_id, api_key, api_secret) 元组
+            instance._creds = (None, None, None)
+            # (api_secret, 预先计算好密钥状态的HMAC-SHA256对象)
+            instance._hmac_template = None
+            cls._instance = instance
         return cls._instance
 
     def set_credentials(self, app_id: str, api_key: str, api_secret: str):
@@ -19,24 +27,39 @@ class CredentialsManager:
         :param api_key: API密钥
         :param api_secret: API密钥密钥
         """
-        self.app_id = app_id
-        self.api_key = api_key
-        self.api_secret = api_secret
+        # 密钥不变时复用HMAC的ipad/opad状态，签名时只需复制
+        if api_secret is not None:
+            self._hmac_template = (
+                api_secret,
+                hmac.new(api_secret.encode("utf-8"), digestmod=hashlib.sha256),
+            )
+        self._creds = (app_id, api_key, api_secret)
 
     def get_credentials(self):
         """
         获取讯飞API的认证凭据
         :return: (app_id, api_key, api_secret) 元组
         """
-        return self.app_id, self.api_key, self.api_secret
+        return self._creds
+
+    def new_hmac(self, api_secret: str) -> hmac.HMAC:
+        """
+        获取以api_secret为密钥的HMAC-SHA256对象
+        :param api_secret: API密钥密钥
+        :return: 尚未写入数据的hmac.HMAC对象
+        """
+        template = self._hmac_template
+        if template is not None and template[0] == api_secret:
+            return template[1].copy()
+        return hmac.new(api_secret.encode("utf-8"), digestmod=hashlib.sha256)
 
     def is_configured(self):
         """
         检查凭据是否已配置
         :return: bool
         """
-        return self.app_id is not None and self.api_key is not None and self.api_secret is not None
+        return None not in self._creds
 
 
 # 创建全局实例
-credentials_manager = CredentialsManager()
\ No newline at end of file
+credentials_manager = CredentialsManager()
@@ -4,31 +4,37 @@
 实现音频文件的语音识别功能
 """
 
-import _thread as thread
+import threading
 import time
-from time import mktime
 import websocket
 import base64
-import datetime
-import hashlib
-import hmac
 import json
+import socket
 import ssl
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from email.utils import formatdate
+from urllib.parse import urlencode
+import certifi
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import io
+import os
+import re
 
-# Try to import timezone, use alternative approach if not available
-from datetime import datetime
+# 优先使用SIMD加速的pybase64，不可用时回退到标准库
+try:
+    import pybase64 as b64
+except ImportError:
+    b64 = base64
 
+# 优先使用更快的orjson解析JSON，不可用时回退到标准库
 try:
-    from datetime import timezone
+    import orjson
 
-    UTC_AVAILABLE = True
+    json_loads = orjson.loads
 except ImportError:
-    UTC_AVAILABLE = False
-from urllib.parse import urlencode
-from wsgiref.handlers import format_date_time
-import requests
-import os
+    json_loads = json.loads
 
 # 导入共享凭据管理器
 from tools.credentials_manager import credentials_manager
@@ -36,20 +42,92 @@ from tools.credentials_manager import credentials_manager
 STATUS_FIRST_FRAME = 0  # 第一帧的标识
 STATUS_CONTINUE_FRAME = 1  # 中间帧标识
 STATUS_LAST_FRAME = 2  # 最后一帧的标识
+FRAME_BATCH_SIZE = 8  # 中间帧累积到该数量后合并发送
+DOWNLOAD_BUFFER_SIZE = 64 * 1024  # 从网络读取音频流的缓冲区大小
+AUDIO_PLACEHOLDER = "__XF_AUDIO__"  # 帧模板中音频数据的占位符
+IAT_HOST = "iat.cn-huabei-1.xf-yun.com"  # 语音识别服务地址
+# 签名原文中除date外的固定部分
+SIGNATURE_PREFIX = ("host: " + IAT_HOST + "\ndate: ").encode("utf-8")
+SIGNATURE_SUFFIX = b"\nGET /v1 HTTP/1.1"
+
+# 下载音频共用的会话，复用连接并在连接失败或网关错误时退避重试
+download_session = requests.Session()
+_download_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    # other=0：证书校验等SSL错误不重试，直接进入跳过验证的回退逻辑
+    max_retries=Retry(
+        total=3, backoff_factor=2, status_forcelist=[502, 503, 504], other=0
+    ),
+)
+download_session.mount("http://", _download_adapter)
+download_session.mount("https://", _download_adapter)
+
+# WebSocket连接共用的SSL上下文，校验服务端证书，且CA证书只加载一次
+ssl_context = ssl.create_default_context(cafile=certifi.where())
+
+# 从错误描述中提取握手状态码和错误消息
+STATUS_CODE_PATTERN = re.compile(r"Handshake status (\d+)")
+MESSAGE_PATTERN = re.compile(r'"message":"([^"]+)"')
+
+
+# 估算每个词的结束时间
+def estimate_end_times(begin_times: List[int], word_texts: List[str]) -> List[int]:
+    """
+    根据讯飞文档说明，ed是保留字段，不能使用
+    基于文本长度估算结束时间：每个字符约100ms
+    :param begin_times: 每个词的起始时间（毫秒）
+    :param word_texts: 每个词的文本
+    :return: 每个词的结束时间（毫秒）
+    """
+    return [begin + len(word) * 100 for begin, word in zip(begin_times, word_texts)]
 
 
 class SpeechRecognitionResult:
     def __init__(self):
-        # 存储识别结果
-        self.recognized_text = ""
+        # 存储识别结果片段，读取recognized_text时再合并
+        self.text_parts: List[str] = []
 
         # 存储所有语义单元的结构化数据
         self.semantic_segments: List[Dict[str, Any]] = []
-        # 存储词级详细信息
-        self.word_details: List[Dict[str, Any]] = []
+        # 按列存储词级详细信息，读取word_details时再组装为字典
+        self.begin_times: List[int] = []
+        self._end_times: List[int] = []
+        self.word_texts: List[str] = []
+        self.word_languages: List[str] = []
+        self._word_details: List[Dict[str, Any]] = []
         # 存储错误信息
         self.error_message = ""
 
+    @property
+    def recognized_text(self) -> str:
+        # 合并新收到的片段，重复读取时不再重新拼接
+        if len(self.text_parts) > 1:
+            self.text_parts[:] = ["".join(self.text_parts)]
+        return self.text_parts[0] if self.text_parts else ""
+
+    @property
+    def end_times(self) -> List[int]:
+        # 识别过程中只记录起始时间，读取时再批量计算结束时间
+        if len(self._end_times) != len(self.word_texts):
+            self._end_times = estimate_end_times(self.begin_times, self.word_texts)
+        return self._end_times
+
+    @property
+    def word_details(self) -> List[Dict[str, Any]]:
+        # 只为新增的词组装字典
+        end_times = self.end_times
+        for i in range(len(self._word_details), len(self.word_texts)):
+            self._word_details.append(
+                {
+                    "begin_time": self.begin_times[i],
+                    "end_time": end_times[i],
+                    "text": self.word_texts[i],
+                    "language": self.word_languages[i],
+                }
+            )
+        return self._word_details
+
 
 class Ws_Param(object):
     # 初始化
@@ -60,11 +138,14 @@ class Ws_Param(object):
         APISecret: str,
         AudioFile: str,
         language: str = "none",
+        interval: float = 0.0,
     ):
         self.APPID = APPID
         self.APIKey = APIKey
         self.APISecret = APISecret
         self.AudioFile = AudioFile
+        # 每帧的发送间隔(单位:s)，0表示不限速
+        self.interval = interval
         # 根据讯飞多语种语音识别接口文档配置参数
         self.iat_params = {
             "domain": "slm",
@@ -73,24 +154,41 @@ class Ws_Param(object):
             "accent": "mandarin",
             "result": {"encoding": "utf8", "compress": "raw", "format": "json"},
         }
+        # 预先序列化各状态的帧，发送时只需拼接base64音频数据
+        self.frame_templates = {
+            status: self.build_frame_template(status)
+            for status in (STATUS_FIRST_FRAME, STATUS_CONTINUE_FRAME, STATUS_LAST_FRAME)
+        }
+
+    # 生成帧模板，返回音频数据前后的JSON片段
+    def build_frame_template(self, status: int) -> Tuple[bytes, bytes]:
+        d = {"header": {"status": status, "app_id": self.APPID}}
+        if status == STATUS_FIRST_FRAME:
+            d["parameter"] = {"iat": self.iat_params}
+        d["payload"] = {
+            "audio": {
+                "audio": AUDIO_PLACEHOLDER,
+                "sample_rate": 16000,
+                "encoding": "lame",
+            }
+        }
+        prefix, suffix = (
+            json.dumps(d).encode("utf-8").split(AUDIO_PLACEHOLDER.encode("utf-8"))
+        )
+        return prefix, suffix
 
     # 生成url
     def create_url(self) -> str:
-        url = "wss://iat.cn-huabei-1.xf-yun.com/v1"
+        url = "wss://" + IAT_HOST + "/v1"
         # 生成RFC1123格式的时间戳
-        now = datetime.now()
-        date = format_date_time(mktime(now.timetuple()))
+        date = formatdate(usegmt=True)
 
-        # 拼接字符串
-        signature_origin = "host: " + "iat.cn-huabei-1.xf-yun.com" + "\n"
-        signature_origin += "date: " + date + "\n"
-        signature_origin += "GET " + "/v1 " + "HTTP/1.1"
+        # 拼接字符串，只有date部分每次不同
+        signature_origin = SIGNATURE_PREFIX + date.encode("ascii") + SIGNATURE_SUFFIX
         # 进行hmac-sha256进行加密
-        signature_sha = hmac.new(
-            self.APISecret.encode("utf-8"),
-            signature_origin.encode("utf-8"),
-            digestmod=hashlib.sha256,
-        ).digest()
+        signer = credentials_manager.new_hmac(self.APISecret)
+        signer.update(signature_origin)
+        signature_sha = signer.digest()
         signature_sha = base64.b64encode(signature_sha).decode(encoding="utf-8")
 
         authorization_origin = (
@@ -105,7 +203,7 @@ class Ws_Param(object):
         v = {
             "authorization": authorization,
             "date": date,
-            "host": "iat.cn-huabei-1.xf-yun.com",
+            "host": IAT_HOST,
         }
         # 拼接鉴权参数，生成url
         url = url + "?" + urlencode(v)
@@ -117,7 +215,7 @@ def on_message(ws, message):
     # 通过ws对象获取SpeechRecognitionResult实例
     result = ws.result_instance
 
-    message = json.loads(message)
+    message = json_loads(message)
     code = message["header"]["code"]
     status = message["header"]["status"]
     if code != 0:
@@ -132,65 +230,42 @@ def on_message(ws, message):
         payload = message.get("payload")
         if payload:
             text = payload["result"]["text"]
-            text = json.loads(str(base64.b64decode(text), "utf8"))
+            text = json_loads(b64.b64decode(text, validate=False))
             text_ws = text["ws"]
 
-            segment_text = ""
-            # 处理每个词
-            for word_item in text_ws:
-                cw = word_item["cw"][0]  # 取第一个候选词
-                word = cw["w"]
-                # bg表示起始帧偏移值，每帧=10ms
-                begin_time = word_item.get("bg", 0) * 10  # 转换为毫秒
-
-                # 根据讯飞文档说明，ed是保留字段，不能使用
-                # 当bg=0时（标点符号或结果过长），无参考意义
-                # 我们基于文本长度估算结束时间：每个字符约100ms
-                if begin_time > 0 and len(word) > 0:
-                    # 基于文本长度计算结束时间
-                    end_time = begin_time + len(word) * 100
-                else:
-                    # 对于标点符号或特殊情况，使用默认估算
-                    end_time = begin_time + len(word) * 100
-
-                result.recognized_text += word
-
-                segment_text += word
-                # 获取语言信息
-                language = cw.get("lg", "")  # 默认使用空字符串而不是unknown
-
-                # 创建词项
-                result.word_details.append(
-                    {
-                        "begin_time": begin_time,
-                        "end_time": end_time,
-                        "text": word,
-                        "language": language,
-                    }
-                )
+            start_index = len(result.word_texts)
+            # 按列批量提取每个词的信息
+            candidates = [word_item["cw"][0] for word_item in text_ws]  # 取第一个候选词
+            segment_words = [cw["w"] for cw in candidates]
+            # bg表示起始帧偏移值，每帧=10ms，转换为毫秒
+            # 当bg=0时（标点符号或结果过长），无参考意义
+            result.begin_times.extend(
+                word_item.get("bg", 0) * 10 for word_item in text_ws
+            )
+            result.word_texts.extend(segment_words)
+            # 获取语言信息，默认使用空字符串而不是unknown
+            result.word_languages.extend(cw.get("lg", "") for cw in candidates)
+
+            segment_text = "".join(segment_words)
+            result.text_parts.append(segment_text)
 
             # segment_text 有值才处理
             if segment_text.strip():
                 segment_id = len(result.semantic_segments)
-                segment_start_time = (
-                    result.word_details[-len(text_ws)]["begin_time"]
-                    if result.word_details
-                    else 0
-                )
-                segment_end_time = (
-                    result.word_details[-1]["end_time"] if result.word_details else 0
+                end_index = len(result.word_texts) - 1
+                # 结束时间按最后一个词的文本长度估算
+                end_time = (
+                    result.begin_times[end_index]
+                    + len(result.word_texts[end_index]) * 100
                 )
 
                 result.semantic_segments.append(
                     {
                         "id": segment_id,
                         "text": segment_text,
-                        "begin_time": segment_start_time,
-                        "end_time": segment_end_time,
-                        "word_indices": [
-                            len(result.word_details) - len(text_ws),
-                            len(result.word_details) - 1,
-                        ],
+                        "begin_time": result.begin_times[start_index],
+                        "end_time": end_time,
+                        "word_indices": [start_index, end_index],
                     }
                 )
 
@@ -204,19 +279,21 @@ def on_error(ws, error):
     # 解析错误信息，提取状态码和消息
     error_str = str(error)
 
-    # 尝试提取状态码和消息内容
-    status_code = None
+    # 握手失败时websocket-client的异常直接携带状态码和响应体
+    status_code = getattr(error, "status_code", None)
     message_content = None
+    resp_body = getattr(error, "resp_body", None)
+    if isinstance(resp_body, bytes):
+        resp_body = resp_body.decode("utf-8", errors="replace")
 
     # 查找状态码
-    import re
-
-    status_match = re.search(r"Handshake status (\d+)", error_str)
-    if status_match:
-        status_code = status_match.group(1)
+    if status_code is None:
+        status_match = STATUS_CODE_PATTERN.search(error_str)
+        if status_match:
+            status_code = status_match.group(1)
 
     # 查找消息内容
-    message_match = re.search(r'"message":"([^"]+)"', error_str)
+    message_match = MESSAGE_PATTERN.search(resp_body or error_str)
     if message_match:
         message_content = message_match.group(1)
 
@@ -244,6 +321,35 @@ def on_close(ws, close_status_code, close_msg):
     print("### 语音识别连接已关闭 ###")
 
 
+# 批量发送缓存的音频帧
+def flush_frames(ws, pending: List[bytes]):
+    """
+    一次性发送缓存的音频帧，每帧仍是独立的JSON消息
+    Linux下通过TCP_CORK将多帧合并为尽量少的TCP报文
+    :param ws: WebSocketApp对象
+    :param pending: 待发送的帧列表，发送后清空
+    """
+    sock = getattr(ws.sock, "sock", None)
+    cork = sock is not None and hasattr(socket, "TCP_CORK")
+    if cork:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+    try:
+        for frame in pending:
+            ws.send(frame)
+    finally:
+        pending.clear()
+        if cork:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+
+
+# 记录发送音频时的错误
+def record_send_error(result: SpeechRecognitionResult, e: Exception):
+    print(f"发送数据时出错: {e}")
+    # 服务端拒绝会话时on_message已记录真实错误并关闭连接，随后的发送失败不覆盖该错误
+    if not result.error_message:
+        result.error_message = f"发送数据时出错: {str(e)}"
+
+
 # 收到websocket连接建立的处理
 def on_open(ws):
     def run(*args):
@@ -253,57 +359,46 @@ def on_open(ws):
             ws_param = result.ws_param
 
             frameSize = 1280  # 每一帧的音频大小
-            interval = 0.04  # 发送音频间隔(单位:s)
+            interval = ws_param.interval  # 发送音频间隔(单位:s)
             status = STATUS_FIRST_FRAME  # 音频的状态信息，标识音频是第一帧，还是中间帧、最后一帧
 
             # 处理URL或本地文件路径
-            temp_file = None
             if ws_param.AudioFile.startswith(
                 "http://"
             ) or ws_param.AudioFile.startswith("https://"):
-                # 如果是URL，先下载文件
-                print(f"正在从URL下载音频文件: {ws_param.AudioFile}")
+                # 如果是URL，边下载边发送，不落地临时文件
+                print(f"正在从URL读取音频流: {ws_param.AudioFile}")
 
-                # 添加重试机制
-                max_retries = 3
-                for attempt in range(max_retries):
+                # 连接失败或网关错误由会话的重试策略处理
+                try:
+                    # 首先尝试正常验证SSL证书
                     try:
-                        # 首先尝试正常验证SSL证书
-                        try:
-                            response = requests.get(
-                                ws_param.AudioFile, stream=True, timeout=30
-                            )
-                        except requests.exceptions.SSLError:
-                            # 如果SSL验证失败，给出警告并尝试跳过验证
-                            print("警告：SSL证书验证失败，正在尝试跳过验证下载")
-                            response = requests.get(
-                                ws_param.AudioFile,
-                                stream=True,
-                                verify=False,
-                                timeout=30,
-                            )
-                        response.raise_for_status()
-
-                        # 创建临时文件
-                        temp_file = "temp_audio_file_" + str(int(time.time())) + ".mp3"
-                        with open(temp_file, "wb") as f:
-                            for chunk in response.iter_content(chunk_size=8192):
-                                if chunk:
-                                    f.write(chunk)
-                        audio_file_path = temp_file
-                        print(f"音频文件已下载到: {audio_file_path}")
-                        break  # 成功下载，跳出重试循环
-                    except Exception as e:
-                        print(
-                            f"下载音频文件失败 (尝试 {attempt + 1}/{max_retries}): {e}"
+                        response = download_session.get(
+                            ws_param.AudioFile, stream=True, timeout=30
                         )
-                        if attempt < max_retries - 1:
-                            print("等待2秒后重试...")
-                            time.sleep(2)
-                        else:
-                            print("已达到最大重试次数，下载失败")
-                            result.error_message = f"下载音频文件失败: {str(e)}"
-                            return
+                    except requests.exceptions.SSLError:
+                        # 如果SSL验证失败，给出警告并尝试跳过验证
+                        print("警告：SSL证书验证失败，正在尝试跳过验证下载")
+                        response = download_session.get(
+                            ws_param.AudioFile,
+                            stream=True,
+                            verify=False,
+                            timeout=30,
+                        )
+                    response.raise_for_status()
+                    # 按Content-Encoding自动解压响应内容
+                    response.raw.decode_content = True
+                    # 读完最后的数据时urllib3会自动关闭响应，导致BufferedReader
+                    # 无法返回缓冲区中剩余的数据，需关闭自动关闭
+                    response.raw.auto_close = False
+                    # 按64KiB批量读取网络数据，每帧从缓冲区中取出
+                    audio_stream = io.BufferedReader(
+                        response.raw, buffer_size=DOWNLOAD_BUFFER_SIZE
+                    )
+                except Exception as e:
+                    print(f"下载音频文件失败: {e}")
+                    result.error_message = f"下载音频文件失败: {str(e)}"
+                    return
             else:
                 # 检查本地文件是否存在
                 if not os.path.exists(ws_param.AudioFile):
@@ -311,101 +406,79 @@ def on_open(ws):
                     print(error_msg)
                     result.error_message = error_msg
                     return
-                # 如果是本地文件路径，直接使用
-                audio_file_path = ws_param.AudioFile
-
-            with open(audio_file_path, "rb") as fp:
+                # 如果是本地文件路径，直接打开
+                audio_stream = open(ws_param.AudioFile, "rb")
+
+            # 复用同一块缓冲区读取音频帧，避免每帧分配新对象
+            buf = bytearray(frameSize)
+            view = memoryview(buf)
+            # 待合并发送的中间帧
+            pending = []
+            frames_sent = 0
+            start_time = time.monotonic()
+            with audio_stream as fp:
                 while True:
                     # 检查WebSocket连接是否仍然打开
                     if not hasattr(ws, "sock") or ws.sock is None:
                         print("WebSocket连接已关闭，停止发送数据")
                         break
 
-                    buf = fp.read(frameSize)
-                    audio = str(base64.b64encode(buf), "utf-8")
+                    n = fp.readinto(buf)
 
-                    # 文件结束
-                    if not audio:
+                    # 文件结束，最后一帧不带音频数据
+                    if not n:
                         status = STATUS_LAST_FRAME
+                        audio = b""
+                    else:
+                        audio = b64.b64encode(view[:n])
+                    prefix, suffix = ws_param.frame_templates[status]
+                    frame = prefix + audio + suffix
                     # 第一帧处理
                     if status == STATUS_FIRST_FRAME:
-                        d = {
-                            "header": {"status": 0, "app_id": ws_param.APPID},
-                            "parameter": {"iat": ws_param.iat_params},
-                            "payload": {
-                                "audio": {
-                                    "audio": audio,
-                                    "sample_rate": 16000,
-                                    "encoding": "lame",
-                                }
-                            },
-                        }
                         try:
-                            ws.send(json.dumps(d))
+                            ws.send(frame)
                             status = STATUS_CONTINUE_FRAME
                         except Exception as e:
-                            print(f"发送数据时出错: {e}")
-                            result.error_message = f"发送数据时出错: {str(e)}"
+                            record_send_error(result, e)
                             break
                     # 中间帧处理
                     elif status == STATUS_CONTINUE_FRAME:
-                        d = {
-                            "header": {"status": 1, "app_id": ws_param.APPID},
-                            "payload": {
-                                "audio": {
-                                    "audio": audio,
-                                    "sample_rate": 16000,
-                                    "encoding": "lame",
-                                }
-                            },
-                        }
-                        try:
-                            ws.send(json.dumps(d))
-                        except Exception as e:
-                            print(f"发送数据时出错: {e}")
-                            result.error_message = f"发送数据时出错: {str(e)}"
-                            break
+                        pending.append(frame)
+                        if len(pending) >= FRAME_BATCH_SIZE:
+                            try:
+                                flush_frames(ws, pending)
+                            except Exception as e:
+                                record_send_error(result, e)
+                                break
                     # 最后一帧处理
                     elif status == STATUS_LAST_FRAME:
-                        d = {
-                            "header": {"status": 2, "app_id": ws_param.APPID},
-                            "payload": {
-                                "audio": {
-                                    "audio": audio,
-                                    "sample_rate": 16000,
-                                    "encoding": "lame",
-                                }
-                            },
-                        }
+                        pending.append(frame)
                         try:
-                            ws.send(json.dumps(d))
+                            flush_frames(ws, pending)
                             break
                         except Exception as e:
-                            print(f"发送数据时出错: {e}")
-                            result.error_message = f"发送数据时出错: {str(e)}"
+                            record_send_error(result, e)
                             break
 
-                    # 模拟音频采样间隔
-                    time.sleep(interval)
+                    # 按累计发送帧数限速，允许落后时突发追赶
+                    if interval:
+                        frames_sent += 1
+                        delay = start_time + frames_sent * interval - time.monotonic()
+                        if delay > 0:
+                            time.sleep(delay)
 
             print("音频数据发送完成")
 
-            # 清理临时文件
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                    print(f"临时文件已删除: {temp_file}")
-                except Exception as e:
-                    print(f"删除临时文件失败: {e}")
-
         except Exception as e:
             # 捕获所有未处理的异常
             error_msg = f"处理音频时发生未预期的错误: {str(e)}"
             print(error_msg)
-            if hasattr(ws, "result_instance"):
+            if hasattr(ws, "result_instance") and not ws.result_instance.error_message:
                 ws.result_instance.error_message = error_msg
 
-    thread.start_new_thread(run, ())
+    # 发送线程与run_forever的接收循环并行，上传音频的同时处理识别结果
+    ws.sender_thread = threading.Thread(target=run, name="xf-asr-sender", daemon=True)
+    ws.sender_thread.start()
 
 
 def speech_to_text(audio_file: str, language: str = "none") -> SpeechRecognitionResult:
@@ -418,16 +491,12 @@ def speech_to_text(audio_file: str, language: str = "none") -> SpeechRecognition
     # 创建实例以避免全局变量
     result = SpeechRecognitionResult()
 
-    # 重置识别结果
-    result.recognized_text = ""
-    result.semantic_segments = []
-    result.word_details = []
-
-    # 从共享凭据管理器获取认证信息
-    if not credentials_manager.is_configured():
+    # 从共享凭据管理器获取一份认证信息快照，检查与使用同一份数据
+    credentials = credentials_manager.get_credentials()
+    if None in credentials:
         raise Exception("讯飞API凭据未配置，请先设置app_id、api_key和api_secret")
 
-    app_id, api_key, api_secret = credentials_manager.get_credentials()
+    app_id, api_key, api_secret = credentials
 
     # 使用共享凭据管理器中的认证信息
     result.ws_param = Ws_Param(
@@ -449,10 +518,20 @@ def speech_to_text(audio_file: str, language: str = "none") -> SpeechRecognition
     ws.on_open = on_open
 
     # 添加更多连接选项以提高稳定性
+    # 跳过websocket-client对接收文本帧的UTF-8校验和解码，on_message收到的是bytes，
+    # 由JSON解析器直接解析bytes并校验UTF-8编码
     ws.run_forever(
-        sslopt={"cert_reqs": ssl.CERT_NONE}, ping_interval=30, ping_timeout=10
+        sslopt={"context": ssl_context},
+        ping_interval=30,
+        ping_timeout=10,
+        skip_utf8_validation=True,
     )
 
+    # 等待发送线程退出，确保其错误信息已写入结果
+    sender_thread = getattr(ws, "sender_thread", None)
+    if sender_thread is not None:
+        sender_thread.join(timeout=10)
+
     # 检查是否有错误信息
     if result.error_message:
         raise Exception(result.error_message)
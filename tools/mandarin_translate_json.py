@@ -5,23 +5,84 @@
 """
 
 import base64
+import binascii
 import hashlib
-import hmac
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 import re
-from typing import List, Dict, Any, Optional, Tuple
-from datetime import datetime
-
-# Try to import timezone, use alternative approach if not available
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from email.utils import formatdate
+from urllib.parse import urlparse
+
+# 优先使用更快的orjson，不可用时回退到标准库
 try:
-    from datetime import timezone
+    import orjson
 
-    UTC_AVAILABLE = True
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
 except ImportError:
-    UTC_AVAILABLE = False
+
+    def json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    json_loads = json.loads
+
+# 标记分割方案中的段落标记，如 [XF_SEGMENT_0]
+SEGMENT_MARKER_TEMPLATE = "[XF_SEGMENT_{}]"
+SEGMENT_MARKER_PATTERN = re.compile(r"\[XF_SEGMENT_(\d+)\]")
+
+# 增强标记方案中的段落标记，如 【0】
+ENHANCED_MARKER_TEMPLATE = "【{}】"
+ENHANCED_MARKER_PATTERN = re.compile(r"【(\d+)】")
+
+# 清理译文时需要移除的 [] 标记及需要合并的空白字符
+BRACKET_MARKER_PATTERN = re.compile(r"\[.*?\]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# 智能分割时可作为分割点的字符
+SPLIT_CHARS = frozenset("。！？，；： 、")
+
+# 文件名中不允许的字符替换为下划线
+FORBIDDEN_FILENAME_TABLE = str.maketrans({c: "_" for c in '\\/:*?"<>|'})
+
+# 请求失败时错误信息中最多保留的响应体字节数，避免解码过大的错误页面
+ERROR_BODY_PREVIEW_BYTES = 512
+
+# 预序列化请求体时文本位置的占位符
+TEXT_PLACEHOLDER = "__TEXT_PLACEHOLDER__"
+
+# 标记分割方案每次请求的最大字符数（含标记），避免超出接口单次文本长度限制
+TRANSLATE_CHUNK_MAX_CHARS = 1500
+
+# 分块并发翻译时的最大线程数
+TRANSLATE_CHUNK_WORKERS = 4
+
+# 翻译接口共用的会话，多次请求复用同一HTTPS连接
+# 连接失败或网关错误时短暂退避后重试；读取超时不重试（read=0），避免同一请求被重复计费；
+# 重试用尽后仍返回响应，由call_url按状态码给出错误信息
+translate_session = requests.Session()
+translate_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=2,
+            read=0,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=["POST"],
+            raise_on_status=False,
+        ),
+    ),
+)
 
 # 导入共享凭据管理器
 from tools.credentials_manager import credentials_manager
@@ -41,6 +102,12 @@ def set_credentials(app_id: str, api_key: str, api_secret: str):
 
 
 class TranslationResult:
+    __slots__ = (
+        "full_translation",
+        "segment_translations",
+        "transcription_error_message",
+    )
+
     def __init__(self):
         # 存储翻译结果
         self.full_translation = ""
@@ -50,19 +117,34 @@ class TranslationResult:
         self.transcription_error_message = ""
 
 
+# 部分分块翻译失败时抛出，携带失败分块已回退为原文的翻译结果
+class PartialTranslationError(Exception):
+    def __init__(self, translations: Dict[int, str], failed_ids: List[int]):
+        super().__init__(f"{len(failed_ids)} 个段落翻译失败: {failed_ids}")
+        self.translations = translations
+        self.failed_ids = failed_ids
+
+
 # 翻译API类
 class TranslationAPI(object):
+    # 以下为POST请求的固定参数
+    RequestUri = "/v2/ots"
+    HttpMethod = "POST"
+    Algorithm = "hmac-sha256"
+    HttpProto = "HTTP/1.1"
+
     def __init__(self, host: str):
         self.transcription_error_message = ""
 
-        # 从共享凭据管理器获取认证信息
-        if not credentials_manager.is_configured():
+        # 从共享凭据管理器获取一份认证信息快照
+        credentials = credentials_manager.get_credentials()
+        if None in credentials:
             self.transcription_error_message = (
                 "讯飞API凭据未配置，请先设置app_id、api_key和api_secret"
             )
             return
 
-        app_id, api_key, api_secret = credentials_manager.get_credentials()
+        app_id, api_key, api_secret = credentials
 
         # 应用ID（到控制台获取）
         self.APPID = app_id
@@ -73,91 +155,62 @@ class TranslationAPI(object):
 
         # 以下为POST请求
         self.Host = host
-        self.RequestUri = "/v2/ots"
         # 设置url
         self.url = "https://" + host + self.RequestUri
-        self.HttpMethod = "POST"
-        self.Algorithm = "hmac-sha256"
-        self.HttpProto = "HTTP/1.1"
 
-        # 设置当前时间，使用 compatible method based on Python version
-        if UTC_AVAILABLE:
-            curTime_utc = datetime.now(timezone.utc)
-        else:
-            curTime_utc = datetime.utcnow()
-        self.Date = self.httpdate(curTime_utc)
+        # Authorization头中除签名外的部分在实例生命周期内不变，预先拼接
+        self.auth_header_prefix = (
+            f'api_key="{self.APIKey}", algorithm="{self.Algorithm}", '
+            'headers="host date request-line digest", signature="'
+        )
+        # 当前时间（RFC 1123格式的GMT时间）及签名原文前缀，由refresh_date设置
+        self.Date = ""
+        self.signature_prefix = b""
+        self.refresh_date()
         # 设置业务参数
         # 语种列表参数值请参照接口文档：https://www.xfyun.cn/doc/nlp/niutrans/API.html
         self.Text = ""
+        # 预先序列化的请求体前后缀，请求时只需拼入编码后的文本
+        self.body_template: Optional[Tuple[bytes, bytes]] = None
         self.BusinessArgs = {
             "from": "auto",
             "to": "zh",
         }
 
-    def hashlib_256(self, res: str) -> str:
-        m = hashlib.sha256(bytes(res.encode(encoding="utf-8"))).digest()
+    def refresh_date(self):
+        # 签名前刷新时间，避免实例创建后较晚才发送请求时Date已过期导致鉴权失败
+        date = formatdate(usegmt=True)
+        if date == self.Date:
+            return
+        self.Date = date
+        # 签名原文中除digest外的部分只随时间变化
+        self.signature_prefix = (
+            f"host: {self.Host}\ndate: {date}\n"
+            f"{self.HttpMethod} {self.RequestUri} {self.HttpProto}\ndigest: "
+        ).encode("utf-8")
+
+    def hashlib_256(self, res: bytes) -> str:
+        m = hashlib.sha256(res).digest()
         result = "SHA-256=" + base64.b64encode(m).decode(encoding="utf-8")
         return result
 
-    def httpdate(self, dt: datetime) -> str:
-        """
-        Return a string representation of a date according to RFC 1123
-        (HTTP/1.1).
-
-        The supplied date must be in UTC.
-
-        """
-        weekday = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"][dt.weekday()]
-        month = [
-            "Jan",
-            "Feb",
-            "Mar",
-            "Apr",
-            "May",
-            "Jun",
-            "Jul",
-            "Aug",
-            "Sep",
-            "Oct",
-            "Nov",
-            "Dec",
-        ][dt.month - 1]
-        return "%s, %02d %s %04d %02d:%02d:%02d GMT" % (
-            weekday,
-            dt.day,
-            month,
-            dt.year,
-            dt.hour,
-            dt.minute,
-            dt.second,
-        )
-
     def generateSignature(self, digest: str) -> str:
-        signatureStr = "host: " + self.Host + "\n"
-        signatureStr += "date: " + self.Date + "\n"
-        signatureStr += (
-            self.HttpMethod + " " + self.RequestUri + " " + self.HttpProto + "\n"
-        )
-        signatureStr += "digest: " + digest
-        signature = hmac.new(
-            bytes(self.Secret.encode(encoding="utf-8")),
-            bytes(signatureStr.encode(encoding="utf-8")),
-            digestmod=hashlib.sha256,
-        ).digest()
-        result = base64.b64encode(signature)
+        # 复用凭据管理器中预先计算好密钥状态的HMAC对象
+        signer = credentials_manager.new_hmac(self.Secret)
+        signer.update(self.signature_prefix)
+        signer.update(digest.encode("utf-8"))
+        result = base64.b64encode(signer.digest())
         return result.decode(encoding="utf-8")
 
-    def init_header(self, data: str) -> Dict[str, str]:
+    def init_header(self, data: bytes) -> Dict[str, str]:
+        self.refresh_date()
         digest = self.hashlib_256(data)
         sign = self.generateSignature(digest)
-        authHeader = (
-            'api_key="%s", algorithm="%s", '
-            'headers="host date request-line digest", '
-            'signature="%s"' % (self.APIKey, self.Algorithm, sign)
-        )
+        authHeader = self.auth_header_prefix + sign + '"'
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
+            "Connection": "keep-alive",
             "Method": "POST",
             "Host": self.Host,
             "Date": self.Date,
@@ -166,16 +219,26 @@ class TranslationAPI(object):
         }
         return headers
 
-    def get_body(self) -> str:
-        content = str(base64.b64encode(self.Text.encode("utf-8")), "utf-8")
+    def encode_text(self) -> bytes:
+        return binascii.b2a_base64(self.Text.encode("utf-8"), newline=False)
+
+    def build_body_template(self) -> Tuple[bytes, bytes]:
         postdata = {
             "common": {"app_id": self.APPID},
             "business": self.BusinessArgs,
             "data": {
-                "text": content,
+                "text": TEXT_PLACEHOLDER,
             },
         }
-        body = json.dumps(postdata)
+        prefix, suffix = json_dumps(postdata).split(TEXT_PLACEHOLDER.encode("utf-8"))
+        return prefix, suffix
+
+    def get_body(self) -> bytes:
+        if self.body_template is None:
+            self.body_template = self.build_body_template()
+        prefix, suffix = self.body_template
+        # base64结果只含ASCII字符，无需JSON转义，可直接拼入请求体
+        body = prefix + self.encode_text() + suffix
         return body
 
     def call_url(self) -> Optional[str]:
@@ -190,7 +253,7 @@ class TranslationAPI(object):
             body = self.get_body()
             headers = self.init_header(body)
             try:
-                response = requests.post(
+                response = translate_session.post(
                     self.url, data=body, headers=headers, timeout=8
                 )
                 status_code = response.status_code
@@ -200,7 +263,9 @@ class TranslationAPI(object):
                         "Http请求失败，状态码："
                         + str(status_code)
                         + "，错误信息："
-                        + response.text
+                        + response.content[:ERROR_BODY_PREVIEW_BYTES].decode(
+                            "utf-8", "replace"
+                        )
                     )
                     print(error_msg)
                     print(
@@ -210,7 +275,7 @@ class TranslationAPI(object):
                     return None
                 else:
                     # 鉴权成功
-                    respData = json.loads(response.text)
+                    respData = json_loads(response.content)
                     print("翻译结果返回:", respData)
                     # 以下仅用于调试
                     code = str(respData["code"])
@@ -247,12 +312,78 @@ def translate_text(segments: List[Dict[str, Any]]) -> Optional[Dict[int, str]]:
 
     print(f"\n开始翻译 {len(segments)} 个语义单元")
 
+    # 文本较长时按长度分块，各块独立加标记并发翻译，再按段落编号合并
+    chunks = chunk_segments(segments)
+    if len(chunks) == 1:
+        return translate_marked_chunk(segments)
+
+    print(f"分为 {len(chunks)} 块并发翻译")
+    segment_translations = {}
+    failed_ids = []
+    with ThreadPoolExecutor(
+        max_workers=min(TRANSLATE_CHUNK_WORKERS, len(chunks))
+    ) as executor:
+        for chunk, chunk_translations in zip(
+            chunks, executor.map(translate_chunk_with_retry, chunks)
+        ):
+            if chunk_translations is not None:
+                segment_translations.update(chunk_translations)
+                continue
+            # 失败分块使用原文，不影响其他分块的结果
+            for segment in chunk:
+                segment_translations[segment["id"]] = segment["text"]
+                failed_ids.append(segment["id"])
+
+    # 部分分块失败时告知调用方，由其决定是否采用部分结果
+    if failed_ids:
+        raise PartialTranslationError(segment_translations, failed_ids)
+    return segment_translations
+
+
+# 翻译一个分块，失败时重试一次，仍失败则返回None
+def translate_chunk_with_retry(
+    segments: List[Dict[str, Any]],
+) -> Optional[Dict[int, str]]:
+    for attempt in range(2):
+        try:
+            return translate_marked_chunk(segments)
+        except Exception as e:
+            print(f"分块翻译失败（第 {attempt + 1} 次）: {str(e)}")
+    return None
+
+
+# 按带标记文本的长度把段落分块，每块不超过max_chars个字符（单段超长时独占一块）
+def chunk_segments(
+    segments: List[Dict[str, Any]], max_chars: int = TRANSLATE_CHUNK_MAX_CHARS
+) -> List[List[Dict[str, Any]]]:
+    chunks = []
+    current = []
+    current_chars = 0
+    for segment in segments:
+        length = len(SEGMENT_MARKER_TEMPLATE.format(segment["id"])) + len(
+            segment["text"]
+        )
+        if current and current_chars + length > max_chars:
+            chunks.append(current)
+            current = []
+            current_chars = 0
+        current.append(segment)
+        current_chars += length
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# 以标记分割方案翻译一组段落，失败时抛出异常
+def translate_marked_chunk(segments: List[Dict[str, Any]]) -> Dict[int, str]:
     # 为每个句子添加唯一标记
-    marked_text = ""
+    parts = []
+    append = parts.append
     for segment in segments:
         # 使用特殊标记格式，确保翻译后能准确分割
-        marker = f"[XF_SEGMENT_{segment['id']}]"
-        marked_text += f"{marker}{segment['text']}"
+        append(SEGMENT_MARKER_TEMPLATE.format(segment["id"]))
+        append(segment["text"])
+    marked_text = "".join(parts)
 
     # 拼接带标记的文本进行翻译
     host = "ntrans.xfyun.cn"
@@ -287,22 +418,18 @@ def translate_text(segments: List[Dict[str, Any]]) -> Optional[Dict[int, str]]:
     # 提取每个标记点的翻译结果
     segment_translations = {}
 
-    # 修复原代码中的逻辑错误：原代码中for循环内部变量作用域问题
-    for segment in segments:
-        marker = f"[XF_SEGMENT_{segment['id']}]"
-        start_pos = full_translation.find(marker)
-
-        if start_pos != -1:
-            # 找到下一个标记或文本末尾
-            next_marker = f"[XF_SEGMENT_{segment['id']+1}]"
-            end_pos = full_translation.find(next_marker, start_pos)
-
-            if end_pos == -1:
-                end_pos = len(full_translation)
+    # 按标记一次切分译文，得到 [前缀, 编号, 译文, 编号, 译文, ...]
+    parts = SEGMENT_MARKER_PATTERN.split(full_translation)
+    marked_translations = {}
+    for i in range(1, len(parts), 2):
+        # 同一编号出现多次时以第一次为准
+        marked_translations.setdefault(int(parts[i]), parts[i + 1])
 
+    for segment in segments:
+        translation = marked_translations.get(segment["id"])
+        if translation is not None:
             # 提取翻译文本（去除标记）
-            translation = full_translation[start_pos + len(marker) : end_pos].strip()
-            clean_translation = clean_markers_from_translation(translation)
+            clean_translation = clean_markers_from_translation(translation.strip())
             segment_translations[segment["id"]] = clean_translation
         else:
             # 如果找不到标记，使用原文
@@ -324,33 +451,31 @@ def smart_split_translation(
 
     # 方法1：基于字符数比例分割
     total_original_chars = sum(len(seg["text"]) for seg in segments)
+    total_len = len(full_translation)
+    last_index = len(segments) - 1
 
     if total_original_chars == 0:
-        # 如果原文为空，平均分配
-        avg_length = len(full_translation) // len(segments)
-        for i, segment in enumerate(segments):
-            start_pos = i * avg_length
-            end_pos = (
-                (i + 1) * avg_length if i < len(segments) - 1 else len(full_translation)
-            )
+        # 如果原文为空，平均分配，最后一段取剩余内容
+        avg_length = total_len // len(segments)
+        bounds = [i * avg_length for i in range(len(segments))] + [total_len]
+        for segment, start_pos, end_pos in zip(segments, bounds, bounds[1:]):
             segment_translations[segment["id"]] = full_translation[
                 start_pos:end_pos
             ].strip()
         return segment_translations
 
-    # 基于原文长度比例分配翻译结果
+    # 基于原文长度比例分配翻译结果，预先计算每段应占用的翻译长度
+    segment_lengths = [
+        int(total_len * (len(seg["text"]) / total_original_chars)) for seg in segments
+    ]
     current_pos = 0
     for i, segment in enumerate(segments):
-        if i == len(segments) - 1:
+        if i == last_index:
             # 最后一个段落，取剩余所有内容
             segment_translation = full_translation[current_pos:].strip()
         else:
-            # 计算当前段落应该占用的翻译长度
-            segment_ratio = len(segment["text"]) / total_original_chars
-            segment_length = int(len(full_translation) * segment_ratio)
-
             # 寻找合适的分割点（避免在词的中间分割）
-            target_pos = current_pos + segment_length
+            target_pos = current_pos + segment_lengths[i]
 
             # 向前或向后寻找空格、标点符号等自然分割点
             best_split_pos = find_best_split_position(
@@ -376,22 +501,19 @@ def find_best_split_position(text: str, target_pos: int, min_pos: int) -> int:
     if target_pos <= min_pos:
         return min_pos
 
-    # 定义分割点的优先级（从高到低）
-    split_chars = ["。", "！", "？", "，", "；", "：", " ", "、"]
-
     # 在目标位置附近搜索最佳分割点（搜索范围：前后5个字符）
     search_range = 5
 
     for offset in range(search_range + 1):
         # 先向后搜索
         pos = target_pos + offset
-        if pos < len(text) and text[pos] in split_chars:
+        if pos < len(text) and text[pos] in SPLIT_CHARS:
             return pos + 1  # 在分割字符后分割
 
         # 再向前搜索
         if offset > 0:
             pos = target_pos - offset
-            if pos > min_pos and text[pos] in split_chars:
+            if pos > min_pos and text[pos] in SPLIT_CHARS:
                 return pos + 1
 
     # 如果找不到合适的分割点，直接使用目标位置
@@ -408,11 +530,15 @@ def translate_text_with_enhanced_markers(
     print(f"\n开始翻译 {len(segments)} 个语义单元（增强标记方案）")
 
     # 使用增强标记的翻译方案
-    marked_text = ""
+    parts = []
+    append = parts.append
     for segment in segments:
         # 使用简单的中文标记，翻译系统更容易保留
-        marker = f"【{segment['id']}】"
-        marked_text += f"{marker}{segment['text']}{marker}"
+        marker = ENHANCED_MARKER_TEMPLATE.format(segment["id"])
+        append(marker)
+        append(segment["text"])
+        append(marker)
+    marked_text = "".join(parts)
 
     print(f"待翻译文本（增强标记）: {marked_text}")
 
@@ -433,29 +559,31 @@ def translate_text_with_enhanced_markers(
         # 尝试提取标记分割的结果
         segment_translations = {}
 
+        # 一次扫描记录每个段落标记出现的位置
+        marker_positions = {}
+        for match in ENHANCED_MARKER_PATTERN.finditer(full_translation):
+            marker_positions.setdefault(int(match.group(1)), []).append(match)
+
         for segment in segments:
             segment_id = segment["id"]
-            start_marker = f"【{segment_id}】"
+            markers = marker_positions.get(segment_id, [])
 
-            # 查找第一个标记位置
-            first_marker_pos = full_translation.find(start_marker)
-            if first_marker_pos == -1:
+            # 第一个标记为起始标记
+            if not markers:
                 print(f"未找到段落 {segment_id} 的起始标记")
                 segment_translations[segment_id] = segment["text"]
                 continue
 
-            # 查找第二个相同标记的位置（结束标记）
-            second_marker_pos = full_translation.find(
-                start_marker, first_marker_pos + len(start_marker)
-            )
-            if second_marker_pos == -1:
+            # 第二个相同标记为结束标记
+            if len(markers) < 2:
                 print(f"未找到段落 {segment_id} 的结束标记")
                 segment_translations[segment_id] = segment["text"]
                 continue
 
             # 提取两个标记之间的内容
-            start_pos = first_marker_pos + len(start_marker)
-            translation = full_translation[start_pos:second_marker_pos].strip()
+            translation = full_translation[
+                markers[0].end() : markers[1].start()
+            ].strip()
 
             segment_translations[segment_id] = (
                 translation if translation else segment["text"]
@@ -478,17 +606,99 @@ def translate_text_with_enhanced_markers(
         raise Exception(error_msg)
 
 
+# 按行编号批量翻译 - 首选方案，一次请求完成所有段落
+def translate_batched(segments: List[Dict[str, Any]]) -> Optional[Dict[int, str]]:
+    if not segments:
+        return None
+
+    print(f"\n开始翻译 {len(segments)} 个语义单元（行编号方案）")
+
+    # 每个段落一行，格式为 "编号||原文"，段落内的换行替换为空格
+    numbered_text = "\n".join(
+        f"{segment['id']}||{' '.join(segment['text'].splitlines())}"
+        for segment in segments
+    )
+    # 该方案只发送一次请求，超出单次长度限制时必然失败，直接交给分块的标记方案
+    if len(numbered_text) > TRANSLATE_CHUNK_MAX_CHARS:
+        raise Exception(
+            f"文本长度 {len(numbered_text)} 超过单次请求上限 {TRANSLATE_CHUNK_MAX_CHARS}"
+        )
+
+    host = "ntrans.xfyun.cn"
+    translator = TranslationAPI(host)
+    translator.Text = numbered_text
+    full_translation = translator.call_url()
+
+    if not full_translation or translator.transcription_error_message:
+        raise Exception(translator.transcription_error_message or "翻译失败")
+
+    # 一次遍历按行拆分，取回每个编号对应的译文
+    segment_translations = {}
+    for line in full_translation.splitlines():
+        segment_id, separator, translation = line.partition("||")
+        if not separator:
+            continue
+        try:
+            segment_translations.setdefault(
+                int(segment_id.strip()), translation.strip()
+            )
+        except ValueError:
+            continue
+
+    missing = [seg["id"] for seg in segments if seg["id"] not in segment_translations]
+    if missing:
+        raise Exception(f"行编号翻译结果缺少段落: {missing}")
+
+    # 译文为空时使用原文
+    return {
+        seg["id"]: segment_translations[seg["id"]] or seg["text"] for seg in segments
+    }
+
+
 # 清理翻译结果中的所有标记
 def clean_markers_from_translation(translation: str) -> str:
-    import re
-
     # 移除所有【数字】格式的标记
-    clean_text = re.sub(r"【\d+】", "", translation)
+    clean_text = ENHANCED_MARKER_PATTERN.sub("", translation)
     # 移除[] 标记
-    clean_text = re.sub(r"\[.*?\]", "", translation)
+    clean_text = BRACKET_MARKER_PATTERN.sub("", clean_text)
     # 移除多余空格
-    clean_text = re.sub(r"\s+", " ", clean_text).strip()
-    return clean_text
+    return WHITESPACE_PATTERN.sub(" ", clean_text).strip()
+
+
+# 翻译单段文本，同一进程内相同文本的成功结果会被缓存
+@lru_cache(maxsize=1024)
+def translate_one(text: str) -> str:
+    host = "ntrans.xfyun.cn"
+    translator = TranslationAPI(host)
+    translator.Text = text
+    translation = translator.call_url()
+
+    if not translation or translator.transcription_error_message:
+        raise Exception(translator.transcription_error_message or "翻译失败")
+    return translation
+
+
+# 执行单个翻译策略，结果完整且不全是原文时才视为成功
+def run_strategy(
+    strategy_name: str,
+    strategy_func: Callable[[List[Dict[str, Any]]], Optional[Dict[int, str]]],
+    segments: List[Dict[str, Any]],
+) -> Optional[Dict[int, str]]:
+    try:
+        print(f"尝试策略: {strategy_name}")
+        result = strategy_func(segments)
+        if result and len(result) == len(segments):
+            # 验证翻译质量：如果所有结果都是原文，说明翻译失败
+            if not all(result[seg["id"]] == seg["text"] for seg in segments):
+                print(f"策略 {strategy_name} 成功")
+                return result
+    except PartialTranslationError as e:
+        # 部分结果交由调用方在没有完整结果时使用
+        print(f"策略 {strategy_name} 部分失败: {str(e)}")
+        raise
+    except Exception as e:
+        print(f"策略 {strategy_name} 失败: {str(e)}")
+    return None
 
 
 # 推荐的最终解决方案：结合多种策略
@@ -502,36 +712,65 @@ def translate_text_robust(segments: List[Dict[str, Any]]) -> Optional[Dict[int,
     # 如果只有1个段落，直接翻译
     if len(segments) == 1:
         try:
-            host = "ntrans.xfyun.cn"
-            translator = TranslationAPI(host)
-            translator.Text = segments[0]["text"]
-            translation = translator.call_url()
-
-            if translation and not translator.transcription_error_message:
-                return {segments[0]["id"]: translation}
+            return {segments[0]["id"]: translate_one(segments[0]["text"])}
         except:
             pass
         return {segments[0]["id"]: segments[0]["text"]}
 
-    # 多段落情况：依次尝试不同策略
-    strategies = [
-        ("标记分割", lambda: translate_text(segments)),
-        ("增强标记", lambda: translate_text_with_enhanced_markers(segments)),
-        ("智能分割", lambda: translate_and_smart_split(segments)),
+    # 相同原文只翻译一次，翻译后再按段落编号展开
+    unique_indices: Dict[str, int] = {}
+    for segment in segments:
+        unique_indices.setdefault(segment["text"], len(unique_indices))
+    if len(unique_indices) < len(segments):
+        print(f"去重后需翻译 {len(unique_indices)} 个语义单元")
+        unique_segments = [
+            {"id": index, "text": text} for text, index in unique_indices.items()
+        ]
+        unique_translations = translate_text_robust(unique_segments)
+        return {
+            segment["id"]: unique_translations[unique_indices[segment["text"]]]
+            for segment in segments
+        }
+
+    # 多段落情况：优先一次请求完成的行编号方案
+    result = run_strategy("行编号", translate_batched, segments)
+    if result:
+        return result
+
+    # 基于标记的策略相互独立，同时请求并采用最先得到的完整结果
+    partial_result = None
+    marker_strategies = [
+        ("标记分割", translate_text),
+        ("增强标记", translate_text_with_enhanced_markers),
     ]
+    executor = ThreadPoolExecutor(max_workers=len(marker_strategies))
+    try:
+        futures = [
+            executor.submit(run_strategy, strategy_name, strategy_func, segments)
+            for strategy_name, strategy_func in marker_strategies
+        ]
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except PartialTranslationError as e:
+                # 部分结果不参与竞争，继续等待其他策略的完整结果
+                partial_result = e.translations
+                continue
+            if result:
+                return result
+    finally:
+        # 已得到结果时不再等待其余策略
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    # 标记均被破坏时，整段翻译后智能分割
+    result = run_strategy("智能分割", translate_and_smart_split, segments)
+    if result:
+        return result
 
-    for strategy_name, strategy_func in strategies:
-        try:
-            print(f"尝试策略: {strategy_name}")
-            result = strategy_func()
-            if result and len(result) == len(segments):
-                # 验证翻译质量：如果所有结果都是原文，说明翻译失败
-                if not all(result[seg["id"]] == seg["text"] for seg in segments):
-                    print(f"策略 {strategy_name} 成功")
-                    return result
-        except Exception as e:
-            print(f"策略 {strategy_name} 失败: {str(e)}")
-            continue
+    # 没有完整结果时，采用部分翻译结果（失败段落为原文）
+    if partial_result is not None:
+        print("所有策略均未得到完整结果，使用部分翻译结果")
+        return partial_result
 
     # 所有策略都失败，返回原文
     print("所有翻译策略都失败，返回原文")
@@ -561,6 +800,8 @@ def create_json_result(
     segments: List[Dict[str, Any]],
     word_details: List[Dict[str, Any]],
     segment_translations: Dict[int, str],
+    word_languages: Optional[List[str]] = None,
+    word_end_times: Optional[List[int]] = None,
 ) -> str:
     # 获取安全的文件名
     # file_name = get_safe_filename(audio_file)
@@ -570,69 +811,65 @@ def create_json_result(
     print("---Json处理---")
     print(f"传过来的翻译: {full_translation}")
     print("---开始处理---")
-    for i, segment in enumerate(segments):
+
+    # 按列读取词级信息，调用方已持有列数据时直接传入，避免逐个字典取值
+    if word_languages is None:
+        word_languages = [word["language"] for word in word_details or ()]
+    if word_end_times is None:
+        word_end_times = [word.get("end_time", 0) for word in word_details or ()]
+
+    get_translation = segment_translations.get
+    word_count = len(word_details) if word_details else 0
+    for sentence_id, segment in enumerate(segments, 1):
+        # 每个片段的字段只取一次
+        source_text = segment["text"]
+        start_idx, end_idx = segment["word_indices"]
+
         # 获取翻译
-        translation = segment_translations.get(segment["id"], "")
-        print(f"处理第 {i + 1} 个片段: {segment['text']} -> 翻译: {translation}")
+        translation = get_translation(segment["id"], "")
+        print(f"处理第 {sentence_id} 个片段: {source_text} -> 翻译: {translation}")
 
         # 提取词级信息（如果可用）
         words = []
-        if word_details and segment["word_indices"][0] < len(word_details):
-            start_idx, end_idx = segment["word_indices"]
-            words = word_details[start_idx : end_idx + 1]
-
-        # 确定语言
         language = ""
-        if words:
-            lang_counter = {}
-            for word in words:
-                lang = word["language"]
-                if lang:
-                    lang_counter[lang] = lang_counter.get(lang, 0) + 1
+        if start_idx < word_count:
+            words = word_details[start_idx : end_idx + 1]
+            # 确定语言，取片段内出现次数最多的语种（忽略空值）
+            lang_counter = Counter(
+                filter(None, word_languages[start_idx : end_idx + 1])
+            )
             if lang_counter:
-                language = max(lang_counter, key=lang_counter.get)
-
-        sentence_item = {
-            "begin_time": segment["begin_time"],
-            "end_time": segment["end_time"],
-            "source_text": segment["text"],
-            "text": translation,
-            "sentence_id": i + 1,
-            "words": words,
-            "language": language,
-        }
-        sentence_list.append(sentence_item)
-
-    # 获取所有识别出的语言，过滤掉空字符串
-    all_languages = []
-    if word_details and len(word_details) > 0:
-        all_languages = list(set([w["language"] for w in word_details]))
+                language = lang_counter.most_common(1)[0][0]
 
-    # 过滤掉空字符串和None值
-    all_languages = [lang for lang in all_languages if lang]
-
-    # 如果没有识别出语言或过滤后为空，使用空数组
-    if not all_languages:
-        all_languages = []
+        sentence_list.append(
+            {
+                "begin_time": segment["begin_time"],
+                "end_time": segment["end_time"],
+                "source_text": source_text,
+                "text": translation,
+                "sentence_id": sentence_id,
+                "words": words,
+                "language": language,
+            }
+        )
 
-    # 计算总时长 - 修复时长计算逻辑
-    total_duration = 0
+    # 所有识别出的语言，已过滤掉空字符串和None值
+    all_languages = list(set(filter(None, word_languages)))
 
-    # 优先使用词级信息计算总时长
-    if word_details and len(word_details) > 0:
-        # 确保获取最后一个有效词的结束时间
-        for i in range(len(word_details) - 1, -1, -1):
-            if "end_time" in word_details[i] and word_details[i]["end_time"] > 0:
-                total_duration = word_details[i]["end_time"]
-                break
+    # 计算总时长 - 优先使用最后一个有效词的结束时间
+    total_duration = next((t for t in reversed(word_end_times) if t > 0), 0)
 
     # 如果词级信息不可用或没有有效时间，使用语义片段信息
-    if total_duration == 0 and segments and len(segments) > 0:
-        # 确保获取最后一个有效片段的结束时间
-        for i in range(len(segments) - 1, -1, -1):
-            if "end_time" in segments[i] and segments[i]["end_time"] > 0:
-                total_duration = segments[i]["end_time"]
-                break
+    if total_duration == 0 and segments:
+        # 从后往前取最后一个有效片段的结束时间
+        total_duration = next(
+            (
+                segment["end_time"]
+                for segment in reversed(segments)
+                if segment.get("end_time", 0) > 0
+            ),
+            0,
+        )
 
     # 最后回退到基于文本长度的估算
     if total_duration == 0 and recognized_text:
@@ -680,10 +917,8 @@ def get_safe_filename(file_path: str) -> str:
     :return: 安全的文件名
     """
     # 获取文件名（不含扩展名）
-    if file_path.startswith("http://") or file_path.startswith("https://"):
+    if file_path.startswith(("http://", "https://")):
         # 如果是URL，提取路径部分并获取文件名
-        from urllib.parse import urlparse
-
         parsed_url = urlparse(file_path)
         file_name = os.path.basename(parsed_url.path)
         # 如果URL路径没有文件名，使用时间戳
@@ -698,7 +933,7 @@ def get_safe_filename(file_path: str) -> str:
 
     # 移除或替换不允许的字符
     # Windows不允许的字符: \ / : * ? " < > |
-    file_name = re.sub(r'[\\/:*?"<>|]', "_", file_name)
+    file_name = file_name.translate(FORBIDDEN_FILENAME_TABLE)
 
     # 限制文件名长度
     if len(file_name) > 100:
@@ -72,6 +72,8 @@ def xunfei_mandarin_asr_translate(audio_file: str, language: str = "none") -> tu
         recognition_result.semantic_segments,
         recognition_result.word_details,
         segment_translations,
+        word_languages=recognition_result.word_languages,
+        word_end_times=recognition_result.end_times,
     )
 
     return full_translation, translations_json, ""